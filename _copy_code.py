@@ -9,14 +9,10 @@ It uses 'pbcopy' on macOS for robust clipboard support and 'pyperclip'
 for other systems.
 """
 
+import functools
 import os
 import sys
-import subprocess
-
-try:
-    import pyperclip
-except ImportError:
-    pyperclip = None
+from concurrent.futures import ThreadPoolExecutor
 
 # --- CONFIGURATION ---
 # Add folder names you want to exclude from the scan.
@@ -67,6 +63,9 @@ EXCLUDED_EXTENSIONS = {
     ".DS_Store",
 }
 
+# Number of leading bytes checked for NUL to detect binary files.
+BINARY_PROBE_SIZE = 8192
+
 # Mapping of file extensions to Markdown language identifiers.
 LANGUAGE_MAP = {
     ".py": "python",
@@ -92,55 +91,125 @@ LANGUAGE_MAP = {
     "dockerfile": "dockerfile",
 }
 
+# Lowercased once so a single str.endswith() call can test every extension.
+_EXCLUDED_SUFFIXES = tuple(ext.lower() for ext in EXCLUDED_EXTENSIONS)
+
 
 # --- END OF CONFIGURATION ---
 
 
-def get_language_identifier(filename):
-    """Gets the Markdown language identifier for a given filename."""
-    name_lower = filename.lower()
-    if "." not in name_lower:
-        return LANGUAGE_MAP.get(name_lower, "")
-    _root, ext = os.path.splitext(name_lower)
+@functools.cache
+def _lang_for_ext(ext):
+    """Looks up the Markdown language identifier for an extension (or dotless name)."""
     return LANGUAGE_MAP.get(ext, "")
 
 
-def generate_tree(start_path, prefix=""):
+def get_language_identifier(name_lower):
+    """Gets the Markdown language identifier for an already lowercased filename."""
+    _root, dot, ext = name_lower.rpartition(".")
+    if not dot:
+        return _lang_for_ext(name_lower)
+    return _lang_for_ext("." + ext)
+
+
+def generate_tree(start_path):
     """Generates a tree-like string representation of the directory structure."""
     tree_lines = []
-    # Get directory contents and filter out excluded items
-    try:
-        entries = sorted(os.listdir(start_path))
-    except FileNotFoundError:
-        return []
-
-    filtered_entries = []
-    for entry in entries:
-        full_path = os.path.join(start_path, entry)
-        if entry in EXCLUDED_DIRS or entry in EXCLUDED_FILES:
-            continue
-        _root, ext = os.path.splitext(entry)
-        if ext.lower() in EXCLUDED_EXTENSIONS:
+    # Each item is (line to emit, directory to expand or None, prefix for its children).
+    # Children are pushed in reverse so that popping yields the usual depth-first order.
+    stack = [(None, start_path, "")]
+    while stack:
+        line, dir_path, prefix = stack.pop()
+        if line is not None:
+            tree_lines.append(line)
+        if dir_path is None:
             continue
-        filtered_entries.append(entry)
 
-    for i, entry in enumerate(filtered_entries):
-        connector = "└── " if i == len(filtered_entries) - 1 else "├── "
-        tree_lines.append(f"{prefix}{connector}{entry}")
+        # Get directory contents and filter out excluded items
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except FileNotFoundError:
+            continue
 
-        full_path = os.path.join(start_path, entry)
-        if os.path.isdir(full_path):
-            extension = "    " if i == len(filtered_entries) - 1 else "│   "
-            tree_lines.extend(generate_tree(full_path, prefix + extension))
+        filtered_entries = []
+        for entry in entries:
+            name = entry.name
+            if (
+                name in EXCLUDED_DIRS
+                or name in EXCLUDED_FILES
+                or name.lower().endswith(_EXCLUDED_SUFFIXES)
+            ):
+                continue
+            filtered_entries.append(entry)
+
+        # Connector and child prefixes are built once per directory, not per entry
+        branch, last_branch = prefix + "├── ", prefix + "└── "
+        child_prefix, last_child_prefix = prefix + "│   ", prefix + "    "
+        last = len(filtered_entries) - 1
+        for i in range(last, -1, -1):
+            entry = filtered_entries[i]
+            child_dir = entry.path if entry.is_dir(follow_symlinks=False) else None
+            if i == last:
+                stack.append((last_branch + entry.name, child_dir, last_child_prefix))
+            else:
+                stack.append((branch + entry.name, child_dir, child_prefix))
 
     return tree_lines
 
 
+def iter_files(start_path):
+    """Yields file entries below start_path depth-first, skipping excluded directories."""
+    stack = [start_path]
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    subdirs.append(entry.path)
+            elif entry.is_file():
+                yield entry
+
+        # Reversed so that popping visits subdirectories in sorted order
+        stack.extend(reversed(subdirs))
+
+
+def read_file(job):
+    """Reads one (path, lowercased name) job into (path, lang, content, error)."""
+    file_path, name_lower = job
+    try:
+        # A single unbuffered read plus one decode is cheaper than TextIOWrapper
+        with open(file_path, "rb", buffering=0) as f:
+            head = f.read(BINARY_PROBE_SIZE)
+            # A NUL byte near the start means a binary file: skip it without decoding
+            if b"\x00" in head:
+                return file_path, "", None, None
+            raw = head + f.read()
+    except Exception as e:
+        return file_path, "", None, e
+
+    if not raw.strip():
+        return file_path, "", None, None
+
+    content = raw.decode("utf-8", "ignore")
+    return file_path, get_language_identifier(name_lower), content, None
+
+
 def copy_to_clipboard(text: str):
     """Copies the given text to the system clipboard."""
     platform = sys.platform
+    # Clipboard backends are imported here so the scan can start without paying for them
     # 'darwin' is the platform name for macOS
     if platform == "darwin":
+        import subprocess
+
         try:
             process = subprocess.Popen(
                 "pbcopy", env={"LANG": "en_US.UTF-8"}, stdin=subprocess.PIPE
@@ -149,7 +218,14 @@ def copy_to_clipboard(text: str):
             print("\n✅ Success! Copied to clipboard using pbcopy (macOS).")
         except FileNotFoundError:
             print("\n⚠️ 'pbcopy' command not found. Cannot copy to clipboard on macOS.")
-    elif pyperclip:
+        return
+
+    try:
+        import pyperclip
+    except ImportError:
+        pyperclip = None
+
+    if pyperclip:
         pyperclip.copy(text)
         print("\n✅ Success! Copied to clipboard using pyperclip.")
     else:
@@ -171,39 +247,33 @@ def main():
     tree_block = f"# Project Tree\n```\n{tree_string}\n```\n\n"
     final_output_parts.append(tree_block)
 
-    # 2. Walk through directories and read files
+    # 2. Walk through directories and collect the files to read
     print("Processing files...")
-    for root, dirs, files in os.walk(".", topdown=True):
-        # Efficiently exclude directories by modifying the list in-place
-        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-
-        for filename in sorted(files):
-            # Check against excluded files and extensions
-            if filename in EXCLUDED_FILES:
+    jobs = []
+    for entry in iter_files("."):
+        filename = entry.name
+        name_lower = filename.lower()
+        # Check against excluded files and extensions
+        if filename in EXCLUDED_FILES or name_lower.endswith(_EXCLUDED_SUFFIXES):
+            continue
+        jobs.append((entry.path, name_lower))
+
+    # Reads overlap in worker threads; map() keeps results in walk order
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for file_path, lang, content, error in executor.map(read_file, jobs):
+            if error is not None:
+                print(f"  - Error reading file {file_path}: {error}")
                 continue
-
-            _root_ext, ext = os.path.splitext(filename)
-            if ext.lower() in EXCLUDED_EXTENSIONS:
+            if content is None:
                 continue
 
-            file_path = os.path.join(root, filename)
             relative_path = os.path.normpath(file_path)
-
-            try:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-
-                if not content.strip():
-                    continue
-
-                lang = get_language_identifier(filename)
-
-                file_block = f"# {relative_path}\n```{lang}\n{content}\n```\n\n"
-                final_output_parts.append(file_block)
-                print(f"  - Processed: {relative_path}")
-
-            except Exception as e:
-                print(f"  - Error reading file {file_path}: {e}")
+            # Appended separately so the file content is not copied into a new string
+            final_output_parts.append(f"# {relative_path}\n```{lang}\n")
+            final_output_parts.append(content)
+            final_output_parts.append("\n```\n\n")
+            print(f"  - Processed: {relative_path}")
 
     # 3. Assemble and copy to clipboard
     final_output = "".join(final_output_parts)
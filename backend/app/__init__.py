@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import os
 from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -19,6 +22,10 @@ PROTECTED_PREFIXES = settings.private_path_prefixes
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Password hashing runs on the default executor; bound it so a login burst cannot
+    # spawn more hashing threads than there are cores.
+    executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='ejapp-hash')
+    asyncio.get_running_loop().set_default_executor(executor)
     if settings.e2e:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
@@ -27,6 +34,8 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         await engine.dispose()
+        # Each app start installs a fresh pool, so release this one's threads on shutdown.
+        executor.shutdown(wait=False)
 
 
 def _register_cors(app: FastAPI) -> None:
@@ -42,11 +51,13 @@ def _register_cors(app: FastAPI) -> None:
 def _register_private_middleware(app: FastAPI) -> None:
     @app.middleware('http')
     async def _guard_private(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
-        if request.url.path.startswith(PROTECTED_PREFIXES):
+        # The raw ASGI path avoids building a URL object on every request
+        if request.scope['path'].startswith(PROTECTED_PREFIXES):
             auth_header = request.headers.get('authorization')
-            if not auth_header or not auth_header.lower().startswith('bearer '):
+            # Only the 7-character scheme is lowercased; the token is a single slice.
+            if not auth_header or auth_header[:7].lower() != 'bearer ':
                 return JSONResponse(status_code=401, content={'detail': 'Not authenticated'})
-            token = auth_header.split(' ', 1)[1].strip()
+            token = auth_header[7:].strip()
             if not token:
                 return JSONResponse(status_code=401, content={'detail': 'Not authenticated'})
             try:
@@ -1,84 +1,168 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
-from secrets import token_hex
-from typing import Annotated
-
+import asyncio
+import base64
+import hmac
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Annotated, Any
+
+import bcrypt
 import jwt
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.config import settings
-from backend.app.database import get_session, get_user_by_email
+from backend.app.database import get_session, get_user_by_email, get_user_id_by_email
 from backend.app.schemas import Token, UserCreate, UserCredentials
 from backend.db import User
 
 router = APIRouter(prefix='/auth', tags=['auth'])
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/login')
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
+BCRYPT_MAX_PASSWORD_BYTES = 72
+ARGON2_PREFIX = '$argon2'
+# Stored hashes starting with this prefix never match any password.
+UNUSABLE_PASSWORD_PREFIX = '!'
+GOOGLE_PASSWORD_HASH = UNUSABLE_PASSWORD_PREFIX + 'google'
+# argon2-cffi's defaults are the RFC 9106 low-memory profile (argon2id, t=3, m=64 MiB, p=4).
+_password_hasher = PasswordHasher()
+_ACCESS_TTL_S = settings.access_token_expire_minutes * 60
+_REFRESH_TTL_S = settings.refresh_token_expire_minutes * 60
+TOKEN_CACHE_SIZE = 4096
+_verified_tokens: dict[str, Mapping[str, Any]] = {}
+
+
+def _bcrypt_secret(password: str) -> bytes:
+    # bcrypt only reads the first 72 bytes; truncate explicitly, as passlib did, so
+    # long passwords keep matching their stored hashes on bcrypt releases that raise instead.
+    return password.encode()[:BCRYPT_MAX_PASSWORD_BYTES]
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
+    if not hashed_password.startswith(ARGON2_PREFIX):
+        # Hashes created before the switch to argon2id are plain bcrypt.
+        return bcrypt.checkpw(_bcrypt_secret(plain_password), hashed_password.encode())
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return not hashed_password.startswith(ARGON2_PREFIX) or _password_hasher.check_needs_rehash(hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _password_hasher.hash(password)
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
 
+# HS256 tokens are assembled by hand: the header never changes and signing is a single HMAC,
+# so PyJWT's per-call header building and stdlib JSON encoding are skipped.  Tokens are
+# equivalent to ``jwt.encode`` output and verifiable by PyJWT (identical bytes for ASCII
+# claims; orjson writes non-ASCII as raw UTF-8 rather than ``\uXXXX``); decoding still goes through PyJWT.
+_HS256_HEADER = _b64url(orjson.dumps({'alg': 'HS256', 'typ': 'JWT'})) + b'.'
+_HS256_KEY = settings.secret_key.encode()
 
-def _create_token(sub: str, expires_delta: timedelta) -> str:
-    payload = {'sub': sub, 'exp': datetime.now(tz=UTC) + expires_delta}
+
+def _encode_hs256(payload: dict[str, Any]) -> str:
+    signing_input = _HS256_HEADER + _b64url(orjson.dumps(payload))
+    # One-shot OpenSSL HMAC: no Python-level HMAC object is created per token.
+    signature = hmac.digest(_HS256_KEY, signing_input, 'sha256')
+    return (signing_input + b'.' + _b64url(signature)).decode('ascii')
+
+
+def _create_token(sub: str, uid: int, ttl_seconds: int) -> str:
+    # ``exp`` is integer epoch seconds per the JWT spec; no datetime round-trip needed.
+    payload = {'sub': sub, 'uid': uid, 'exp': int(time.time()) + ttl_seconds}
+    if settings.algorithm == 'HS256':
+        return _encode_hs256(payload)
     return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
 
 
-def create_access_token(sub: str, expires: timedelta | None = None) -> str:
-    delta = expires or timedelta(minutes=settings.access_token_expire_minutes)
-    return _create_token(sub, delta)
+def create_access_token(sub: str, uid: int, ttl_seconds: int | None = None) -> str:
+    return _create_token(sub, uid, ttl_seconds or _ACCESS_TTL_S)
+
 
+def create_refresh_token(sub: str, uid: int) -> str:
+    return _create_token(sub, uid, _REFRESH_TTL_S)
 
-def create_refresh_token(sub: str) -> str:
-    delta = timedelta(minutes=settings.refresh_token_expire_minutes)
-    return _create_token(sub, delta)
 
+def decode_token(token: str) -> Mapping[str, Any]:
+    payload = _verified_tokens.get(token)
+    if payload is None:
+        # Invalid tokens raise here and are therefore never cached; the payload is
+        # read-only so callers cannot mutate the shared cached value.
+        payload = MappingProxyType(jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm]))
+        if len(_verified_tokens) >= TOKEN_CACHE_SIZE:
+            # Dicts keep insertion order and hits are re-inserted, so this drops the least recently used token.
+            del _verified_tokens[next(iter(_verified_tokens))]
+        _verified_tokens[token] = payload
+        return payload
 
-def decode_token(token: str) -> dict:
-    return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    # A cached token may have expired since it was first verified; evict it so the
+    # cache only holds tokens that can still be used.
+    exp = payload.get('exp')
+    if exp is not None and exp <= time.time():
+        _verified_tokens.pop(token, None)
+        raise jwt.ExpiredSignatureError('Signature has expired')
+    # Re-inserting a hit moves it to the end, keeping the dict in least-recently-used order.
+    _verified_tokens[token] = _verified_tokens.pop(token)
+    return payload
 
 
-def _issue_tokens(email: str) -> Token:
-    return Token(
-        access_token=create_access_token(email),
-        refresh_token=create_refresh_token(email),
+def _issue_tokens(email: str, uid: int) -> Token:
+    # Both fields are freshly signed strings, so validation would only re-check their type.
+    return Token.model_construct(
+        access_token=create_access_token(email, uid),
+        refresh_token=create_refresh_token(email, uid),
     )
 
 
+async def _insert_user(session: AsyncSession, email: str, hashed_password: str) -> int:
+    # ``RETURNING`` hands back the new id with the INSERT, so no refresh SELECT is needed.
+    return await session.scalar(insert(User).values(email=email, hashed_password=hashed_password).returning(User.id))
+
+
 @router.post('/register', response_model=Token)
 async def register_user(user_in: UserCreate, session: SessionDep) -> Token:
-    existing = await get_user_by_email(session, user_in.email)
-    if existing:
+    if await get_user_id_by_email(session, user_in.email) is not None:
         raise HTTPException(status_code=400, detail='Email already registered')
 
-    user = User(email=user_in.email, hashed_password=get_password_hash(user_in.password))
-    session.add(user)
+    # argon2 is CPU-bound; hash in a worker thread to keep the event loop responsive.
+    hashed_password = await asyncio.to_thread(get_password_hash, user_in.password)
+    user_id = await _insert_user(session, user_in.email, hashed_password)
     await session.commit()
-    await session.refresh(user)
-    return _issue_tokens(user.email)
+    return _issue_tokens(user_in.email, user_id)
 
 
 @router.post('/login', response_model=Token)
 async def login_user(credentials: UserCredentials, session: SessionDep) -> Token:
     user = await get_user_by_email(session, credentials.email)
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await asyncio.to_thread(verify_password, credentials.password, user.hashed_password):
         raise HTTPException(status_code=401, detail='Invalid credentials')
-    return _issue_tokens(user.email)
+    if password_needs_rehash(user.hashed_password):
+        # Upgrade legacy bcrypt (or outdated argon2) hashes while the plain password is at hand.
+        user.hashed_password = await asyncio.to_thread(get_password_hash, credentials.password)
+        await session.commit()
+    return _issue_tokens(user.email, user.id)
 
 
 @router.post('/refresh', response_model=Token)
-async def refresh_access_token(token: TokenDep) -> Token:
+async def refresh_access_token(token: TokenDep, session: SessionDep) -> Token:
     try:
         payload = decode_token(token)
     except jwt.ExpiredSignatureError as exc:
@@ -89,19 +173,25 @@ async def refresh_access_token(token: TokenDep) -> Token:
     sub = payload.get('sub')
     if not sub:
         raise HTTPException(status_code=401, detail='Invalid token payload')
-    return _issue_tokens(sub)
+
+    uid = payload.get('uid')
+    if uid is None:
+        # Tokens issued before the ``uid`` claim existed: resolve it once here.
+        uid = await get_user_id_by_email(session, sub)
+        if uid is None:
+            raise HTTPException(status_code=401, detail='User not found')
+    return _issue_tokens(sub, uid)
 
 
 @router.get('/google/callback', response_model=Token)
 async def google_callback(code: str, session: SessionDep) -> Token:
     google_email = 'googleuser@example.com'
-    user = await get_user_by_email(session, google_email)
-    if not user:
-        user = User(email=google_email, hashed_password=get_password_hash(token_hex(8)))
-        session.add(user)
+    user_id = await get_user_id_by_email(session, google_email)
+    if user_id is None:
+        # Google accounts never log in with a password, so there is nothing worth hashing.
+        user_id = await _insert_user(session, google_email, GOOGLE_PASSWORD_HASH)
         await session.commit()
-        await session.refresh(user)
-    return _issue_tokens(user.email)
+    return _issue_tokens(google_email, user_id)
 
 
 __all__ = ['create_access_token', 'create_refresh_token', 'decode_token', 'oauth2_scheme', 'router']
@@ -20,7 +20,7 @@ class Settings:
     refresh_token_expire_minutes: int = field(default_factory=lambda: int(os.getenv('REFRESH_TOKEN_EXPIRE_MINUTES', 60 * 24 * 90)))
     frontend_origin: str = field(default_factory=lambda: os.getenv('FRONTEND_ORIGIN', 'http://localhost:5173'))
     database_url: str = field(init=False)
-    allowed_origins: list[str] = field(init=False)
+    allowed_origins: tuple[str, ...] = field(init=False)
     e2e: bool = field(default_factory=lambda: os.getenv('E2E') == '1')
     private_path_prefixes: tuple[str, ...] = ('/private',)
 
@@ -42,12 +42,10 @@ class Settings:
             self.database_url = os.getenv('DATABASE_URL', f'sqlite+aiosqlite:///{default_db_path}')
 
         base_origin = self.frontend_origin.rstrip('/')
-        aliases = {
-            base_origin,
-            base_origin.replace('localhost', '127.0.0.1'),
-            base_origin.replace('127.0.0.1', 'localhost'),
-        }
-        self.allowed_origins = sorted(aliases)
+        # The dev server answers on both localhost and 127.0.0.1; ``replace`` is a no-op for
+        # other hosts, so the set collapses to the single configured origin.
+        aliases = {base_origin, base_origin.replace('localhost', '127.0.0.1'), base_origin.replace('127.0.0.1', 'localhost')}
+        self.allowed_origins = tuple(sorted(aliases))
 
 
 settings = Settings()
@@ -1,15 +1,53 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 from backend.app.config import settings
 from backend.db import User
 
-engine = create_async_engine(settings.database_url, echo=False)
-SessionFactory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+DB_POOL_SIZE = 20
+
+
+def _is_in_memory(url: str) -> bool:
+    return ':memory:' in url or 'mode=memory' in url
+
+
+_IN_MEMORY = _is_in_memory(settings.database_url)
+
+
+def _pool_options(url: str) -> dict[str, Any]:
+    # In-memory SQLite lives only as long as its connection, so keep exactly one and share it.
+    if _is_in_memory(url):
+        return {'poolclass': StaticPool}
+    # A fixed-size pool: connections are reused rather than opened for overflow bursts.
+    return {'pool_size': DB_POOL_SIZE, 'max_overflow': 0}
+
+
+engine = create_async_engine(settings.database_url, echo=False, **_pool_options(settings.database_url))
+SessionFactory = async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    # WAL and mmap only apply to database files.  The e2e database is recreated on every
+    # run, so it keeps the default rollback journal.
+    if not _IN_MEMORY:
+        if not settings.e2e:
+            cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-65536')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+
+if engine.dialect.name == 'sqlite':
+    event.listen(engine.sync_engine, 'connect', _set_sqlite_pragmas)
 
 
 async def get_session() -> AsyncIterator[AsyncSession]:
@@ -18,5 +56,10 @@ async def get_session() -> AsyncIterator[AsyncSession]:
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
-    result = await session.execute(select(User).where(User.email == email))
-    return result.scalars().first()
+    # ``users.email`` has a unique index (``ix_users_email``), so this is a single index probe.
+    return await session.scalar(select(User).where(User.email == email))
+
+
+async def get_user_id_by_email(session: AsyncSession, email: str) -> int | None:
+    # Selects only the primary key so no ``User`` row (password hash included) is built.
+    return await session.scalar(select(User.id).where(User.email == email))
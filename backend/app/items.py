@@ -2,13 +2,14 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
 from jwt import PyJWTError
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.auth import decode_token, oauth2_scheme
-from backend.app.database import get_session, get_user_by_email
+from backend.app.database import get_session, get_user_id_by_email
 from backend.app.schemas import ItemCreate, ItemOut, ItemRead
 from backend.db import Item
 
@@ -16,6 +17,9 @@ router = APIRouter(tags=['items'])
 private_router = APIRouter(prefix='/private', tags=['private'])
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
+# Built once; SQLAlchemy's compiled cache then reuses the SQL of both for every call.
+_ITEM_TITLES_STMT = select(Item.title).where(Item.owner_id == bindparam('owner_id'))
+_INSERT_ITEM_STMT = insert(Item).values(title=bindparam('title'), owner_id=bindparam('owner_id')).returning(Item.id)
 
 
 @router.get('/healthz', include_in_schema=False)
@@ -33,20 +37,28 @@ async def _get_user_from_token(token: str, session: AsyncSession) -> int:
     if not email:
         raise HTTPException(status_code=401, detail='Invalid token payload')
 
-    user = await get_user_by_email(session, email)
-    if not user:
+    # Signed tokens carry the user id, so no database lookup is needed.
+    uid = payload.get('uid')
+    if uid is not None:
+        return uid
+
+    user_id = await get_user_id_by_email(session, email)
+    if user_id is None:
         raise HTTPException(status_code=401, detail='User not found')
-    return user.id
+    return user_id
 
 
 @router.get('/items', response_model=list[ItemRead])
 async def read_items(
     session: SessionDep,
     token: TokenDep,
-) -> list[ItemRead]:
+) -> Response:
     user_id = await _get_user_from_token(token, session)
-    result = await session.execute(select(Item.title).where(Item.owner_id == user_id))
-    return [ItemRead(title=title) for title in result.scalars().all()]
+    titles = (await session.scalars(_ITEM_TITLES_STMT, {'owner_id': user_id})).all()
+    # Titles come from a NOT NULL string column, so rows are encoded straight to JSON bytes;
+    # ``response_model`` still documents the shape in the OpenAPI schema.
+    body = orjson.dumps([{'title': title} for title in titles])
+    return Response(content=body, media_type='application/json')
 
 
 @router.post('/items', response_model=ItemOut)
@@ -57,12 +69,11 @@ async def create_item(
 ) -> ItemOut:
     user_id = await _get_user_from_token(token, session)
 
-    item = Item(title=item_in.title, owner_id=user_id)
-    session.add(item)
+    item_id = await session.scalar(_INSERT_ITEM_STMT, {'title': item_in.title, 'owner_id': user_id})
     await session.commit()
-    await session.refresh(item)
 
-    return ItemOut(id=item.id, title=item.title)
+    # ``title`` was validated by ``ItemCreate`` and the id comes from the database.
+    return ItemOut.model_construct(id=item_id, title=item_in.title)
 
 
 @private_router.get('/ping')
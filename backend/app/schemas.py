@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+# Request bodies reject unknown keys; all schemas are immutable once validated.
+_REQUEST_CONFIG = ConfigDict(extra='forbid', frozen=True)
 
 
 class Token(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     access_token: str
     refresh_token: str
     token_type: str = 'bearer'
 
 
 class UserCredentials(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     email: str
     password: str
 
@@ -19,10 +26,14 @@ class UserCreate(UserCredentials):
 
 
 class ItemCreate(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     title: str
 
 
 class ItemRead(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -19,3 +19,6 @@ class Item(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     owner_id = Column(Integer, ForeignKey('users.id'))
+
+    # Covers ``SELECT title FROM items WHERE owner_id = ?`` so listings never touch the table rows.
+    __table_args__ = (Index('ix_items_owner_title', 'owner_id', 'title'),)
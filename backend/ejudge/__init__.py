@@ -24,6 +24,7 @@ from .models import (
     SubmitRunInputRequest,
     SubmitRunReply,
     SubmitRunRequest,
+    build_all_models,
 )
 
 __all__ = [
@@ -44,6 +45,7 @@ __all__ = [
     'SubmitRunInputRequest',
     'SubmitRunReply',
     'SubmitRunRequest',
+    'build_all_models',
     'create_mock_transport',
     'make_get_submit_reply',
     'make_get_user_reply',
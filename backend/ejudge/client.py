@@ -56,7 +56,7 @@ class _FormPayload:
     """Internal representation of multipart/x-www-form-urlencoded payloads."""
 
     data: MutableMapping[str, str]
-    files: MutableMapping[str, tuple[str, bytes | str]]
+    files: MutableMapping[str, tuple[str, bytes, str]]
 
 
 def _stringify(value: Any) -> str:
@@ -65,50 +65,16 @@ def _stringify(value: Any) -> str:
     return str(value)
 
 
-def _prepare_submit_run_payload(request: SubmitRunRequest) -> _FormPayload:
-    payload = request.model_dump(mode='json', by_alias=True, exclude_none=True)
-    payload.pop('action', None)
-
-    data: MutableMapping[str, str] = {}
-    files: MutableMapping[str, tuple[str, bytes | str]] = {}
-
-    source_bytes = payload.pop('file', None)
-    source_text = payload.pop('text_form', None)
-    if source_bytes is not None:
-        files['file'] = ('solution', source_bytes)
-    if source_text is not None:
-        data['text_form'] = source_text
-
-    for key, value in payload.items():
-        data[key] = _stringify(value)
-
-    return _FormPayload(data=data, files=files)
-
-
-def _prepare_submit_run_input_payload(request: SubmitRunInputRequest) -> _FormPayload:
-    payload = request.model_dump(mode='json', by_alias=True, exclude_none=True)
-    payload.pop('action', None)
-
+def _prepare_form_payload(request: SubmitRunRequest | SubmitRunInputRequest) -> _FormPayload:
+    # ``to_multipart`` reads the validated attributes directly, so raw bytes uploads
+    # are passed through untouched instead of round-tripping through ``model_dump``.
     data: MutableMapping[str, str] = {}
-    files: MutableMapping[str, tuple[str, bytes | str]] = {}
-
-    source_bytes = payload.pop('file', None)
-    source_text = payload.pop('text_form', None)
-    if source_bytes is not None:
-        files['file'] = ('solution', source_bytes)
-    if source_text is not None:
-        data['text_form'] = source_text
-
-    stdin_bytes = payload.pop('file_input', None)
-    stdin_text = payload.pop('text_form_input', None)
-    if stdin_bytes is not None:
-        files['file_input'] = ('stdin', stdin_bytes)
-    if stdin_text is not None:
-        data['text_form_input'] = stdin_text
-
-    for key, value in payload.items():
-        data[key] = _stringify(value)
-
+    files: MutableMapping[str, tuple[str, bytes, str]] = {}
+    for name, value in request.to_multipart():
+        if isinstance(value, tuple):
+            files[name] = value
+        else:
+            data[name] = value
     return _FormPayload(data=data, files=files)
 
 
@@ -150,12 +116,12 @@ class EjudgeClient:
     # -- Public API -----------------------------------------------------
 
     async def submit_run(self, request: SubmitRunRequest) -> SubmitRunReply:
-        payload = _prepare_submit_run_payload(request)
+        payload = _prepare_form_payload(request)
         response = await self._request('POST', request.action, data=payload.data, files=payload.files)
         return self._parse_reply(response, SubmitRunReply)
 
     async def submit_run_input(self, request: SubmitRunInputRequest) -> SubmitRunInputReply:
-        payload = _prepare_submit_run_input_payload(request)
+        payload = _prepare_form_payload(request)
         response = await self._request('POST', request.action, data=payload.data, files=payload.files)
         return self._parse_reply(response, SubmitRunInputReply)
 
@@ -176,7 +142,7 @@ class EjudgeClient:
         *,
         params: Mapping[str, Any] | None = None,
         data: Mapping[str, Any] | None = None,
-        files: Mapping[str, tuple[str, bytes | str]] | None = None,
+        files: Mapping[str, tuple[str, bytes, str]] | None = None,
     ) -> httpx.Response:
         request_params = {'json': '1', 'action': action}
         if params:
@@ -1,13 +1,17 @@
-"""Light-weight helpers to mock ejudge for unit tests."""
+"""Light-weight helpers to mock ejudge for unit tests.
+
+The ``make_*`` factories build models with ``model_construct`` and therefore skip
+Pydantic validation.  They are meant for trusted, hand-written test data only.
+"""
 
 from __future__ import annotations
 
-import json
 from collections.abc import Mapping, MutableMapping
-from dataclasses import dataclass
-from typing import Any
+from typing import Any, NamedTuple
+from uuid import UUID
 
 import httpx
+import orjson
 
 from .models import (
     GetSubmitReply,
@@ -21,8 +25,7 @@ from .models import (
 )
 
 
-@dataclass(slots=True)
-class RecordedCall:
+class RecordedCall(NamedTuple):
     """Simple container capturing an outgoing request for assertions."""
 
     method: str
@@ -31,16 +34,43 @@ class RecordedCall:
     content: bytes
 
 
-def _coerce_payload(value: Any) -> tuple[int, Mapping[str, Any]]:
+# Error envelopes are encoded ahead of time so the handler never runs the JSON encoder.
+_MISSING_ACTION_BODY = orjson.dumps({'ok': False, 'error': {'symbol': 'missing-action'}})
+_KNOWN_ACTIONS = ('submit-run', 'submit-run-input', 'get-submit', 'get-user')
+_JSON_HEADERS = (('content-type', 'application/json'),)
+
+
+def _query_action(raw_query: bytes) -> bytes | None:
+    """Extract the ``action`` value from a raw query string without building ``QueryParams``."""
+
+    if raw_query.startswith(b'action='):
+        start = 7
+    else:
+        start = raw_query.find(b'&action=')
+        if start == -1:
+            return None
+        start += 8
+    end = raw_query.find(b'&', start)
+    return raw_query[start:] if end == -1 else raw_query[start:end]
+
+
+def _unhandled_action_body(action: str) -> bytes:
+    return orjson.dumps({'ok': False, 'error': {'symbol': 'unhandled-action', 'message': action}})
+
+
+def _coerce_payload(value: Any) -> tuple[int, bytes]:
     status_code = 200
     payload = value
-    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], int):
+    # Exact type checks keep the common "plain model" path away from ABC instance checks.
+    if type(value) is tuple and len(value) == 2 and type(value[0]) is int:
         status_code, payload = value
 
     if hasattr(payload, 'model_dump_json'):
-        data = json.loads(payload.model_dump_json(by_alias=True, exclude_none=True))
+        data = orjson.dumps(payload.model_dump(mode='json', by_alias=True, exclude_none=True))
+    elif type(payload) is dict:
+        data = orjson.dumps(payload)
     elif isinstance(payload, Mapping):
-        data = dict(payload)
+        data = orjson.dumps(dict(payload))
     else:
         msg = 'Mock payloads must be Pydantic models, dicts or (status, payload) tuples.'
         raise TypeError(msg)
@@ -57,47 +87,58 @@ def create_mock_transport(
 ) -> tuple[httpx.MockTransport, list[RecordedCall]]:
     """Create an :class:`httpx.MockTransport` returning canned ejudge replies."""
 
-    responses: MutableMapping[str, tuple[int, Mapping[str, Any]]] = {}
+    # Keyed by the raw query-string value so dispatch is a single dict lookup.
+    responses: MutableMapping[bytes, tuple[int, bytes]] = {}
     if submit_run is not None:
-        responses['submit-run'] = _coerce_payload(submit_run)
+        responses[b'submit-run'] = _coerce_payload(submit_run)
     if submit_run_input is not None:
-        responses['submit-run-input'] = _coerce_payload(submit_run_input)
+        responses[b'submit-run-input'] = _coerce_payload(submit_run_input)
     if get_submit is not None:
-        responses['get-submit'] = _coerce_payload(get_submit)
+        responses[b'get-submit'] = _coerce_payload(get_submit)
     if get_user is not None:
-        responses['get-user'] = _coerce_payload(get_user)
+        responses[b'get-user'] = _coerce_payload(get_user)
+    for action in _KNOWN_ACTIONS:
+        responses.setdefault(action.encode(), (404, _unhandled_action_body(action)))
 
     calls: list[RecordedCall] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        content = request.content
-        recorded = RecordedCall(method=request.method, url=request.url, headers=httpx.Headers(request.headers), content=content)
-        calls.append(recorded)
+        # ``request.headers`` is already an ``httpx.Headers`` instance; no copy is needed.
+        calls.append(RecordedCall(request.method, request.url, request.headers, request.content))
 
-        action = request.url.params.get('action')
+        action = _query_action(request.url.query)
         if action is None:
-            return httpx.Response(400, json={'ok': False, 'error': {'symbol': 'missing-action'}})
+            return httpx.Response(400, content=_MISSING_ACTION_BODY, headers=_JSON_HEADERS)
 
-        status_and_payload = responses.get(action)
-        if status_and_payload is None:
-            return httpx.Response(404, json={'ok': False, 'error': {'symbol': 'unhandled-action', 'message': action}})
+        status_and_body = responses.get(action)
+        if status_and_body is None:
+            # Rare path: let httpx decode the value so the message matches what was sent.
+            body = _unhandled_action_body(request.url.params['action'])
+            return httpx.Response(404, content=body, headers=_JSON_HEADERS)
 
-        status_code, payload = status_and_payload
-        return httpx.Response(status_code, json=payload)
+        status_code, body = status_and_body
+        return httpx.Response(status_code, content=body, headers=_JSON_HEADERS)
 
     return httpx.MockTransport(handler), calls
 
 
 def make_submit_run_reply(*, run_id: int = 100, run_uuid: str | None = None) -> SubmitRunReply:
-    return SubmitRunReply(ok=True, action='submit-run', result=SubmitRunResult(run_id=run_id, run_uuid=run_uuid))
+    # ``model_construct`` does not coerce, so convert the UUID string ourselves.
+    uuid = UUID(run_uuid) if run_uuid is not None else None
+    return SubmitRunReply.model_construct(ok=True, action='submit-run', result=SubmitRunResult.model_construct(run_id=run_id, run_uuid=uuid))
 
 
 def make_submit_run_input_reply(*, submit_id: int = 200) -> SubmitRunInputReply:
-    return SubmitRunInputReply(ok=True, action='submit-run-input', result=SubmitRunInputResult(submit_id=submit_id))
+    return SubmitRunInputReply.model_construct(ok=True, action='submit-run-input', result=SubmitRunInputResult.model_construct(submit_id=submit_id))
 
 
-def make_submit_details(*, submit_id: int = 300, status: int = 0, status_str: str = 'OK') -> SubmitDetails:
-    return SubmitDetails(
+# Shared instances for the all-defaults case, built on first request.
+_DEFAULT_SUBMIT_DETAILS: SubmitDetails | None = None
+_DEFAULT_USER_PROFILE: UserProfile | None = None
+
+
+def _build_submit_details(submit_id: int, status: int, status_str: str) -> SubmitDetails:
+    return SubmitDetails.model_construct(
         submit_id=submit_id,
         user_id=1,
         prob_id=1,
@@ -109,21 +150,39 @@ def make_submit_details(*, submit_id: int = 300, status: int = 0, status_str: st
     )
 
 
+def make_submit_details(*, submit_id: int = 300, status: int = 0, status_str: str = 'OK') -> SubmitDetails:
+    """Build submit details; the all-defaults call returns a shared instance, so do not mutate it."""
+
+    global _DEFAULT_SUBMIT_DETAILS
+    if submit_id == 300 and status == 0 and status_str == 'OK':
+        if _DEFAULT_SUBMIT_DETAILS is None:
+            _DEFAULT_SUBMIT_DETAILS = _build_submit_details(submit_id, status, status_str)
+        return _DEFAULT_SUBMIT_DETAILS
+    return _build_submit_details(submit_id, status, status_str)
+
+
 def make_get_submit_reply(details: SubmitDetails | None = None) -> GetSubmitReply:
     details = details or make_submit_details()
-    return GetSubmitReply(ok=True, action='get-submit', result=details)
+    return GetSubmitReply.model_construct(ok=True, action='get-submit', result=details)
 
 
 def make_user_profile(*, user_id: int = 1, user_login: str = 'user') -> UserProfile:
-    return UserProfile(user_id=user_id, user_login=user_login)
+    """Build a user profile; the all-defaults call returns a shared instance, so do not mutate it."""
+
+    global _DEFAULT_USER_PROFILE
+    if user_id == 1 and user_login == 'user':
+        if _DEFAULT_USER_PROFILE is None:
+            _DEFAULT_USER_PROFILE = UserProfile.model_construct(user_id=user_id, user_login=user_login)
+        return _DEFAULT_USER_PROFILE
+    return UserProfile.model_construct(user_id=user_id, user_login=user_login)
 
 
 def make_get_user_reply(profile: UserProfile | None = None) -> GetUserReply:
     profile = profile or make_user_profile()
-    return GetUserReply(ok=True, action='get-user', result=profile)
+    return GetUserReply.model_construct(ok=True, action='get-user', result=profile)
 
 
-__all__ = [
+__all__ = (
     'RecordedCall',
     'create_mock_transport',
     'make_get_submit_reply',
@@ -131,4 +190,4 @@ __all__ = [
     'make_submit_details',
     'make_submit_run_input_reply',
     'make_submit_run_reply',
-]
+)
@@ -10,23 +10,42 @@ extend the integration without re-reading the spec from scratch.
 
 from __future__ import annotations
 
-from typing import Annotated, Any, Literal
+from collections.abc import Mapping
+from typing import Annotated, Any, ClassVar, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, IPvAnyAddress, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetJsonSchemaHandler,
+    IPvAnyAddress,
+    NonNegativeInt,
+    PositiveInt,
+    SerializationInfo,
+    SerializerFunctionWrapHandler,
+    StringConstraints,
+    model_serializer,
+    model_validator,
+)
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import CoreSchema
 
 # -- Shared scalar aliases --------------------------------------------------
-# Using ``Annotated`` adds validation metadata directly on the types and keeps
-# downstream model definitions compact.  This follows the more declarative style
-# encouraged in the latest Pydantic releases.
-ContestId = Annotated[int, Field(gt=0, description='Unique ejudge contest identifier.')]
-RunId = Annotated[int, Field(gt=0, description='Numeric identifier of a run returned by submit-run.')]
-SubmitId = Annotated[int, Field(gt=0, description='Identifier of a submit returned by submit-run-input.')]
-UserId = Annotated[int, Field(gt=0, description='ejudge user identifier.')]
-LanguageId = Annotated[int, Field(gt=0, description='Numeric identifier of an ejudge language preset.')]
-ProblemId = Annotated[int, Field(gt=0, description='Numeric identifier of an ejudge problem inside the contest.')]
-Milliseconds = Annotated[int, Field(ge=0, description='Duration reported by ejudge in milliseconds.')]
-BytesCount = Annotated[int, Field(ge=0, description='Memory usage in bytes reported by ejudge.')]
+# The numeric aliases wrap pydantic's ``PositiveInt`` / ``NonNegativeInt`` so every
+# field shares the same constrained-int validator, and each alias carries its one
+# description so it reaches the JSON schema without being repeated per field.
+ContestId = Annotated[PositiveInt, Field(description='Unique ejudge contest identifier.')]
+RunId = Annotated[PositiveInt, Field(description='Numeric identifier of a run returned by submit-run.')]
+SubmitId = Annotated[PositiveInt, Field(description='Identifier of a submit returned by submit-run-input.')]
+UserId = Annotated[PositiveInt, Field(description='ejudge user identifier.')]
+LanguageId = Annotated[PositiveInt, Field(description='Numeric identifier of an ejudge language preset.')]
+ProblemId = Annotated[PositiveInt, Field(description='Numeric identifier of an ejudge problem inside the contest.')]
+Milliseconds = Annotated[NonNegativeInt, Field(description='Duration reported by ejudge in milliseconds.')]
+BytesCount = Annotated[NonNegativeInt, Field(description='Memory usage in bytes reported by ejudge.')]
+
+TrimmedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+"""Identifier-like string with surrounding whitespace removed (never used for code payloads)."""
 
 NotificationKind = Literal['str', 'u64', 'uuid', 'ulid']
 """Supported serialization strategies for the ``notify_queue`` identifier."""
@@ -35,7 +54,48 @@ NotificationKind = Literal['str', 'u64', 'uuid', 'ulid']
 class EjudgeBaseModel(BaseModel):
     """Base class shared by all ejudge integration models."""
 
-    model_config = ConfigDict(extra='forbid', populate_by_name=True, str_strip_whitespace=True)
+    # Validators are built on first use so importing the module stays cheap; see
+    # :func:`build_all_models` for eager construction.
+    model_config = ConfigDict(extra='forbid', defer_build=True)
+
+
+class EjudgeRequest(EjudgeBaseModel):
+    """Base class for request models addressed to a single ejudge ``action``.
+
+    ``action`` is a class-level constant rather than a model field, so it is not
+    validated or stored per instance.  The serializer adds it back to both
+    ``model_dump`` and ``model_dump_json`` unless ``include``/``exclude`` rule it out.
+    """
+
+    action: ClassVar[str]
+
+    @model_validator(mode='before')
+    @classmethod
+    def _accept_own_action(cls, data: Any) -> Any:
+        # Dumps carry ``action``, so accept it back on validation as long as it names this request.
+        if isinstance(data, Mapping) and 'action' in data:
+            if data['action'] != cls.action:
+                raise ValueError(f'``action`` must be {cls.action!r}, got {data["action"]!r}.')
+            data = {key: value for key, value in data.items() if key != 'action'}
+        return data
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, core_schema: CoreSchema, handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        json_schema = handler(core_schema)
+        action = getattr(cls, 'action', None)
+        if handler.mode == 'serialization' and action is not None:
+            target = handler.resolve_ref_schema(json_schema)
+            target.setdefault('properties', {})['action'] = {'const': action, 'title': 'Action', 'type': 'string'}
+            target.setdefault('required', []).append('action')
+        return json_schema
+
+    @model_serializer(mode='wrap')
+    def _serialize_with_action(self, handler: SerializerFunctionWrapHandler, info: SerializationInfo):
+        data = handler(self)
+        include, exclude = info.include, info.exclude
+        if (include is None or 'action' in include) and (exclude is None or 'action' not in exclude):
+            data['action'] = self.action
+        return data
 
 
 class NotificationTarget(EjudgeBaseModel):
@@ -43,20 +103,43 @@ class NotificationTarget(EjudgeBaseModel):
 
     driver: Annotated[int, Field(gt=0, description='ejudge-internal identifier of the notification driver (redis == 1).')]
     kind: Annotated[NotificationKind, Field(description='Interpretation strategy for the queue identifier.')]
-    queue: Annotated[str, Field(min_length=1, max_length=128, description='Opaque identifier of the consumer queue.')]
+    queue: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, min_length=1, max_length=128),
+        Field(description='Opaque identifier of the consumer queue.'),
+    ]
 
-    @model_validator(mode='after')
-    def _normalize_queue(self) -> NotificationTarget:
-        """Trim whitespace and ensure the queue identifier remains non-empty."""
 
-        self.queue = self.queue.strip()
-        if not self.queue:
-            msg = 'Notification queue identifier cannot be empty.'
-            raise ValueError(msg)
-        return self
+MultipartPart = tuple[str, str | tuple[str, bytes, str]]
+"""``(name, value)`` form part; uploads carry a ``(filename, content, content type)`` tuple."""
+
+_SUBMIT_RUN_UPLOADS = {'file': 'solution'}
+_SUBMIT_RUN_INPUT_UPLOADS = {'file': 'solution', 'file_input': 'stdin'}
+
 
+def _multipart_parts(model: BaseModel, uploads: Mapping[str, str]) -> list[MultipartPart]:
+    """Walk the instance ``__dict__`` once and emit the parts httpx expects.
+
+    ``None`` values are skipped, booleans become ``'1'``/``'0'`` and the fields named in
+    ``uploads`` are sent as raw-bytes file uploads.  Field names are used as-is, so
+    this is only suitable for models without aliases.
+    """
 
-class SubmitRunRequest(EjudgeBaseModel):
+    parts: list[MultipartPart] = []
+    for name, value in model.__dict__.items():
+        if value is None:
+            continue
+        filename = uploads.get(name)
+        if filename is not None:
+            parts.append((name, (filename, value, 'application/octet-stream')))
+        elif isinstance(value, bool):
+            parts.append((name, '1' if value else '0'))
+        else:
+            parts.append((name, str(value)))
+    return parts
+
+
+class SubmitRunRequest(EjudgeRequest):
     """Form body for the privileged ``submit-run`` endpoint.
 
     The API accepts multipart form-data.  The model ensures the mutually
@@ -65,119 +148,121 @@ class SubmitRunRequest(EjudgeBaseModel):
     """
 
     contest_id: ContestId
-    action: Literal['submit-run'] = Field(default='submit-run', frozen=True)
-    sender_user_login: Annotated[str | None, Field(description='Optional login to submit on behalf of another user.')] = None
+    action: ClassVar[str] = 'submit-run'
+    sender_user_login: Annotated[TrimmedStr | None, Field(description='Optional login to submit on behalf of another user.')] = None
     sender_user_id: Annotated[UserId | None, Field(description='Alternative numeric identifier for impersonated submissions.')] = None
     sender_ip: Annotated[IPvAnyAddress | None, Field(description='Original client IP address, if the submitter is proxied.')] = None
     sender_ssl_flag: Annotated[bool | None, Field(description='Set to ``True`` when the user submitted via HTTPS.')] = None
     problem_uuid: Annotated[UUID | None, Field(description='UUID of the problem to target. Mutually exclusive with ``problem_name`` and ``problem``.')] = None
-    problem_name: Annotated[str | None, Field(description='Problem short or internal name. Mutually exclusive with ``problem_uuid`` and ``problem``.')] = None
+    problem_name: Annotated[
+        TrimmedStr | None, Field(description='Problem short or internal name. Mutually exclusive with ``problem_uuid`` and ``problem``.')
+    ] = None
     problem: Annotated[ProblemId | None, Field(description='Numeric problem identifier. Mutually exclusive with the other problem selectors.')] = None
     variant: Annotated[int | None, Field(description='Optional variant identifier for variant-aware problem sets.')] = None
-    language_name: Annotated[str | None, Field(description='Short name of the language preset. Mutually exclusive with ``lang_id``.')] = None
-    lang_id: Annotated[int | str | None, Field(description='Language identifier (numeric or short name). Mutually exclusive with ``language_name``.')] = None
+    language_name: Annotated[TrimmedStr | None, Field(description='Short name of the language preset. Mutually exclusive with ``lang_id``.')] = None
+    lang_id: Annotated[
+        int | TrimmedStr | None, Field(description='Language identifier (numeric or short name). Mutually exclusive with ``language_name``.')
+    ] = None
     eoln_type: Annotated[int | None, Field(ge=0, description='Line-ending conversion strategy recognised by ejudge.')] = None
     is_visible: Annotated[bool | None, Field(description='Set to ``True`` to force the submission to be visible in the UI.')] = None
     file: Annotated[bytes | None, Field(description='Source code payload as raw bytes. Mutually exclusive with ``text_form``.')] = None
     text_form: Annotated[str | None, Field(description='Source code payload as UTF-8 text. Mutually exclusive with ``file``.')] = None
     not_ok_is_cf: Annotated[bool | None, Field(description='Treat any non-OK verdict as ``Check Failed`` when set.')] = None
     rejudge_flag: Annotated[bool | None, Field(description='Submit with the low-priority rejudge queue when ``True``.')] = None
-    ext_user_kind: Annotated[str | None, Field(description='External system identifier type, if ejudge should persist it.')] = None
-    ext_user: Annotated[str | None, Field(description='Concrete external system identifier for the submitter.')] = None
+    ext_user_kind: Annotated[TrimmedStr | None, Field(description='External system identifier type, if ejudge should persist it.')] = None
+    ext_user: Annotated[TrimmedStr | None, Field(description='Concrete external system identifier for the submitter.')] = None
     notify_driver: Annotated[int | None, Field(description='Notification driver identifier (see :class:`NotificationTarget`).')] = None
     notify_kind: Annotated[NotificationKind | None, Field(description='Notification queue encoding kind.')] = None
-    notify_queue: Annotated[str | None, Field(description='Notification queue identifier payload.')] = None
+    notify_queue: Annotated[TrimmedStr | None, Field(description='Notification queue identifier payload.')] = None
 
     @model_validator(mode='after')
-    def _ensure_problem_selector(self) -> SubmitRunRequest:
-        """Ejudge expects exactly one problem selector in the request."""
+    def _validate_request(self) -> SubmitRunRequest:
+        """Check the mutually exclusive selectors in a single validator pass.
+
+        Ejudge expects exactly one problem selector, one language selector and one
+        source payload; the notification parameters come as a complete triplet.
+        """
 
         problem_fields = [self.problem_uuid, self.problem_name, self.problem]
         if sum(value is not None for value in problem_fields) != 1:
             raise ValueError('Exactly one of ``problem_uuid``, ``problem_name`` or ``problem`` must be provided.')
-        return self
-
-    @model_validator(mode='after')
-    def _ensure_language_selector(self) -> SubmitRunRequest:
         if (self.language_name is None) == (self.lang_id is None):
             raise ValueError('Exactly one of ``language_name`` or ``lang_id`` must be provided.')
-        return self
-
-    @model_validator(mode='after')
-    def _ensure_source_payload(self) -> SubmitRunRequest:
         if (self.file is None) == (self.text_form is None):
             raise ValueError('Provide either ``file`` bytes or ``text_form`` text payload.')
-        return self
-
-    @model_validator(mode='after')
-    def _ensure_notification_triplet(self) -> SubmitRunRequest:
-        provided = {name: getattr(self, name) for name in ('notify_driver', 'notify_kind', 'notify_queue')}
-        if any(value is not None for value in provided.values()) and not all(value is not None for value in provided.values()):
+        notify_count = (self.notify_driver is not None) + (self.notify_kind is not None) + (self.notify_queue is not None)
+        if notify_count not in (0, 3):
             raise ValueError('Notification parameters must be provided together (driver, kind, queue).')
         return self
 
+    def to_multipart(self) -> list[MultipartPart]:
+        """Encode the request as form parts; ``file`` is uploaded as ``solution``."""
 
-class SubmitRunInputRequest(EjudgeBaseModel):
+        return _multipart_parts(self, _SUBMIT_RUN_UPLOADS)
+
+
+class SubmitRunInputRequest(EjudgeRequest):
     """Form body for the privileged ``submit-run-input`` endpoint."""
 
     contest_id: ContestId
-    action: Literal['submit-run-input'] = Field(default='submit-run-input', frozen=True)
-    sender_user_login: Annotated[str | None, Field(description='Optional login to submit on behalf of another user.')] = None
+    action: ClassVar[str] = 'submit-run-input'
+    sender_user_login: Annotated[TrimmedStr | None, Field(description='Optional login to submit on behalf of another user.')] = None
     sender_user_id: Annotated[UserId | None, Field(description='Alternative numeric identifier for impersonated submissions.')] = None
     sender_ip: Annotated[IPvAnyAddress | None, Field(description='Original client IP address, if the submitter is proxied.')] = None
     sender_ssl_flag: Annotated[bool | None, Field(description='Set to ``True`` when the user submitted via HTTPS.')] = None
-    prob_id: Annotated[str | int, Field(description='Problem identifier (short name, internal name, or numeric id).')]
-    lang_id: Annotated[str | int, Field(description='Language identifier (short name or numeric id).')]
+    prob_id: Annotated[TrimmedStr | int, Field(description='Problem identifier (short name, internal name, or numeric id).')]
+    lang_id: Annotated[TrimmedStr | int, Field(description='Language identifier (short name or numeric id).')]
     eoln_type: Annotated[int | None, Field(ge=0, description='Line-ending conversion strategy recognised by ejudge.')] = None
     file: Annotated[bytes | None, Field(description='Source code payload as raw bytes. Mutually exclusive with ``text_form``.')] = None
     text_form: Annotated[str | None, Field(description='Source code payload as UTF-8 text. Mutually exclusive with ``file``.')] = None
     file_input: Annotated[bytes | None, Field(description='Custom stdin payload as raw bytes. Mutually exclusive with ``text_form_input``.')] = None
     text_form_input: Annotated[str | None, Field(description='Custom stdin payload as text. Mutually exclusive with ``file_input``.')] = None
-    ext_user_kind: Annotated[str | None, Field(description='External system identifier type, if ejudge should persist it.')] = None
-    ext_user: Annotated[str | None, Field(description='Concrete external system identifier for the submitter.')] = None
+    ext_user_kind: Annotated[TrimmedStr | None, Field(description='External system identifier type, if ejudge should persist it.')] = None
+    ext_user: Annotated[TrimmedStr | None, Field(description='Concrete external system identifier for the submitter.')] = None
     notify_driver: Annotated[int | None, Field(description='Notification driver identifier (see :class:`NotificationTarget`).')] = None
     notify_kind: Annotated[NotificationKind | None, Field(description='Notification queue encoding kind.')] = None
-    notify_queue: Annotated[str | None, Field(description='Notification queue identifier payload.')] = None
+    notify_queue: Annotated[TrimmedStr | None, Field(description='Notification queue identifier payload.')] = None
 
     @model_validator(mode='after')
-    def _ensure_source_payload(self) -> SubmitRunInputRequest:
+    def _validate_request(self) -> SubmitRunInputRequest:
+        """Check the source, stdin and notification inputs in a single validator pass."""
+
         if (self.file is None) == (self.text_form is None):
             raise ValueError('Provide either ``file`` bytes or ``text_form`` text payload for the source code.')
-        return self
-
-    @model_validator(mode='after')
-    def _ensure_stdin_payload(self) -> SubmitRunInputRequest:
         if (self.file_input is None) == (self.text_form_input is None):
             raise ValueError('Provide either ``file_input`` bytes or ``text_form_input`` text payload for stdin.')
-        return self
-
-    @model_validator(mode='after')
-    def _ensure_notification_triplet(self) -> SubmitRunInputRequest:
-        provided = {name: getattr(self, name) for name in ('notify_driver', 'notify_kind', 'notify_queue')}
-        if any(value is not None for value in provided.values()) and not all(value is not None for value in provided.values()):
+        notify_count = (self.notify_driver is not None) + (self.notify_kind is not None) + (self.notify_queue is not None)
+        if notify_count not in (0, 3):
             raise ValueError('Notification parameters must be provided together (driver, kind, queue).')
         return self
 
+    def to_multipart(self) -> list[MultipartPart]:
+        """Encode the request as form parts; ``file``/``file_input`` are uploaded as ``solution``/``stdin``."""
+
+        return _multipart_parts(self, _SUBMIT_RUN_INPUT_UPLOADS)
 
-class GetSubmitRequest(EjudgeBaseModel):
+
+class GetSubmitRequest(EjudgeRequest):
     """Query parameters for the privileged ``get-submit`` endpoint."""
 
     contest_id: ContestId
-    action: Literal['get-submit'] = Field(default='get-submit', frozen=True)
+    action: ClassVar[str] = 'get-submit'
     submit_id: SubmitId
 
 
-class GetUserRequest(EjudgeBaseModel):
+class GetUserRequest(EjudgeRequest):
     """Query parameters for the privileged ``get-user`` endpoint."""
 
+    # The only aliased field in the module; ``global_`` must stay settable by name.
+    # Pydantic merges this with the base config, so ``extra``/``defer_build`` are inherited.
+    model_config = ConfigDict(populate_by_name=True)
+
     contest_id: ContestId
-    action: Literal['get-user'] = Field(default='get-user', frozen=True)
+    action: ClassVar[str] = 'get-user'
     other_user_id: Annotated[UserId | None, Field(description='Numeric user identifier to fetch. Mutually exclusive with ``other_user_login``.')] = None
-    other_user_login: Annotated[str | None, Field(description='Login of the user to fetch. Mutually exclusive with ``other_user_id``.')] = None
+    other_user_login: Annotated[TrimmedStr | None, Field(description='Login of the user to fetch. Mutually exclusive with ``other_user_id``.')] = None
     global_: Annotated[bool | None, Field(alias='global', description='Set to true to request global (non contest specific) data.')] = None
 
-    model_config = ConfigDict(extra='forbid', populate_by_name=True, str_strip_whitespace=True)
-
     @model_validator(mode='after')
     def _ensure_selector(self) -> GetUserRequest:
         if (self.other_user_id is None) == (self.other_user_login is None):
@@ -218,11 +303,9 @@ class SubmitRunResult(EjudgeBaseModel):
     run_uuid: Annotated[UUID | None, Field(description='Optional UUID for the created run (depends on ejudge version).')] = None
 
 
-class SubmitRunReply(EjudgeReply):
+class SubmitRunReply(EjudgeReply[SubmitRunResult]):
     """Reply envelope for ``submit-run``."""
 
-    result: Annotated[SubmitRunResult | None, Field(description='Successful payload returned by ejudge.')] = None
-
 
 class SubmitRunInputResult(EjudgeBaseModel):
     """Successful payload returned by ``submit-run-input``."""
@@ -230,11 +313,9 @@ class SubmitRunInputResult(EjudgeBaseModel):
     submit_id: SubmitId
 
 
-class SubmitRunInputReply(EjudgeReply):
+class SubmitRunInputReply(EjudgeReply[SubmitRunInputResult]):
     """Reply envelope for ``submit-run-input``."""
 
-    result: Annotated[SubmitRunInputResult | None, Field(description='Successful payload returned by ejudge.')] = None
-
 
 class SubmitDetails(EjudgeBaseModel):
     """Rich status document returned by ``get-submit`` and notifications."""
@@ -263,11 +344,9 @@ class SubmitDetails(EjudgeBaseModel):
     error: Annotated[str | None, Field(description='Captured stderr produced by the submission.')] = None
 
 
-class GetSubmitReply(EjudgeReply):
+class GetSubmitReply(EjudgeReply[SubmitDetails]):
     """Reply envelope for ``get-submit``."""
 
-    result: Annotated[SubmitDetails | None, Field(description='Successful payload returned by ejudge.')] = None
-
 
 class UserContestState(EjudgeBaseModel):
     """Contest membership details embedded in :class:`UserProfile`."""
@@ -346,14 +425,26 @@ class UserProfile(EjudgeBaseModel):
     infos: Annotated[list[UserInfo] | None, Field(description='Contest-specific profile fields.')] = None
 
 
-class GetUserReply(EjudgeReply):
+class GetUserReply(EjudgeReply[UserProfile]):
     """Reply envelope for ``get-user``."""
 
-    result: Annotated[UserProfile | None, Field(description='Successful payload returned by ejudge.')] = None
+
+def build_all_models() -> None:
+    """Build the validators of every ejudge model up front.
+
+    Models are declared with ``defer_build=True`` and normally compile on first use.
+    Long-running processes that prefer to pay that cost at start-up can call this.
+    """
+
+    pending: list[type[BaseModel]] = [EjudgeBaseModel]
+    while pending:
+        model = pending.pop()
+        pending.extend(model.__subclasses__())
+        model.model_rebuild()
 
 
 # Friendly aliases exported at package level.
-__all__ = [
+__all__ = (
     'ContestId',
     'EjudgeError',
     'EjudgeReply',
@@ -379,4 +470,5 @@ __all__ = [
     'UserId',
     'UserInfo',
     'UserProfile',
-]
+    'build_all_models',
+)
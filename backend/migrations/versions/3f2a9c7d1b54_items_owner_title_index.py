@@ -0,0 +1,27 @@
+"""Add covering index on items (owner_id, title)
+
+Revision ID: 3f2a9c7d1b54
+Revises: 9e96c431b1e1
+Create Date: 2026-10-15 10:12:41.503118
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c7d1b54'
+down_revision: str | Sequence[str] | None = '9e96c431b1e1'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_items_owner_title', 'items', ['owner_id', 'title'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_items_owner_title', table_name='items')
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-import pathlib
+import os
 import sys
 from pathlib import Path
 
@@ -14,40 +14,44 @@ REPO_ROOT = Path(__file__).resolve().parents[2]  # .../ejapp
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+# Tests run against a named in-memory database: no disk I/O, and the dev ``ejapp.db`` is never touched.
+# The engine keeps a single shared connection (StaticPool) for in-memory URLs, which keeps the
+# database alive for the whole session.  Must be set before the app (and its engine) is imported.
+os.environ['DATABASE_URL'] = 'sqlite+aiosqlite:///file:ejapp_tests?mode=memory&cache=shared&uri=true'
+
 from backend.db import Base
 from backend.main import app, engine
 
-DB_FILE = pathlib.Path(__file__).resolve() / 'ejapp_tests.db'
-
-
-@pytest.fixture(autouse=True)
-def _fresh_db_file():
-    """
-    Ensure file-backed SQLite is clean between pytest runs, not just between tests.
-    (Harmless if the DB is elsewhere.)
-    """
-    try:
-        if DB_FILE.exists():
-            DB_FILE.unlink()
-    except Exception:
-        # If it's open, we'll still drop/create tables in the next fixture.
-        pass
-    yield
-
 
-@pytest.fixture()
-def client():
+@pytest.fixture(scope='session')
+def _app_client():
     """
-    Fresh schema for each test, then create a brand-new TestClient bound to the app.
+    Create the schema once and keep a single TestClient (and app lifespan) for the whole run.
     Doing drop/create BEFORE TestClient avoids races with app startup.
     """
 
-    async def reset():
+    async def create_schema():
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
             await conn.run_sync(Base.metadata.create_all)
 
-    asyncio.run(reset())
+    asyncio.run(create_schema())
 
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture()
+def client(_app_client):
+    """
+    Empty every table before each test; DELETE is far cheaper than rebuilding the schema.
+    Runs on the app's own event loop through the TestClient portal.
+    """
+
+    async def truncate():
+        async with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                await conn.execute(table.delete())
+
+    _app_client.portal.call(truncate)
+    yield _app_client
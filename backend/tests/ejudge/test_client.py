@@ -22,7 +22,15 @@ from backend.ejudge import (
 )
 
 
-def test_submit_run_text_payload() -> None:
+@pytest.fixture(scope='module')
+def run():
+    """Run scenarios on one event loop for the whole module instead of a fresh loop per test."""
+
+    with asyncio.Runner() as runner:
+        yield runner.run
+
+
+def test_submit_run_text_payload(run) -> None:
     async def scenario() -> None:
         reply = make_submit_run_reply(run_id=42)
         transport, calls = create_mock_transport(submit_run=reply)
@@ -49,10 +57,10 @@ def test_submit_run_text_payload() -> None:
         assert body['is_visible'] == '1'
         assert body['text_form'] == 'print("hello")'
 
-    asyncio.run(scenario())
+    run(scenario())
 
 
-def test_submit_run_binary_payload() -> None:
+def test_submit_run_binary_payload(run) -> None:
     async def scenario() -> None:
         reply = make_submit_run_reply(run_id=101)
         transport, calls = create_mock_transport(submit_run=reply)
@@ -62,18 +70,20 @@ def test_submit_run_binary_payload() -> None:
                 contest_id=2,
                 problem=3,
                 language_name='cpp',
-                file=b'int main(){}',
+                file=b'int main(){}\xff\xfe',
             )
             await client.submit_run(request)
 
         call = calls[0]
         assert 'multipart/form-data' in call.headers['content-type']
-        assert b'int main(){}' in call.content
+        # Non UTF-8 bytes must reach ejudge unchanged.
+        assert b'int main(){}\xff\xfe' in call.content
+        assert b'filename="solution"' in call.content
 
-    asyncio.run(scenario())
+    run(scenario())
 
 
-def test_submit_run_input_text_payload() -> None:
+def test_submit_run_input_text_payload(run) -> None:
     async def scenario() -> None:
         reply = make_submit_run_input_reply(submit_id=314)
         transport, calls = create_mock_transport(submit_run_input=reply)
@@ -97,10 +107,10 @@ def test_submit_run_input_text_payload() -> None:
         assert body['text_form'] == 'print("42")'
         assert body['text_form_input'] == '1 2 3'
 
-    asyncio.run(scenario())
+    run(scenario())
 
 
-def test_get_submit_roundtrip() -> None:
+def test_get_submit_roundtrip(run) -> None:
     async def scenario() -> None:
         details = make_submit_details(submit_id=555, status=1, status_str='WA')
         reply = make_get_submit_reply(details)
@@ -115,10 +125,10 @@ def test_get_submit_roundtrip() -> None:
         assert call.url.params['contest_id'] == '1'
         assert call.url.params['submit_id'] == '555'
 
-    asyncio.run(scenario())
+    run(scenario())
 
 
-def test_get_user_roundtrip() -> None:
+def test_get_user_roundtrip(run) -> None:
     async def scenario() -> None:
         reply = make_get_user_reply()
         transport, calls = create_mock_transport(get_user=reply)
@@ -132,10 +142,10 @@ def test_get_user_roundtrip() -> None:
         assert call.url.params['other_user_login'] == 'john'
         assert call.url.params['contest_id'] == '4'
 
-    asyncio.run(scenario())
+    run(scenario())
 
 
-def test_error_reply_raises() -> None:
+def test_error_reply_raises(run) -> None:
     async def scenario() -> None:
         bad_reply = make_submit_run_reply(run_id=1).model_copy(update={'ok': False})
         transport, _ = create_mock_transport(submit_run=bad_reply)
@@ -145,10 +155,10 @@ def test_error_reply_raises() -> None:
             with pytest.raises(EjudgeReplyError):
                 await client.submit_run(request)
 
-    asyncio.run(scenario())
+    run(scenario())
 
 
-def test_http_error_raises_client_error() -> None:
+def test_http_error_raises_client_error(run) -> None:
     async def scenario() -> None:
         def handler(request: httpx.Request) -> httpx.Response:
             return httpx.Response(500, json={'detail': 'boom'})
@@ -160,4 +170,19 @@ def test_http_error_raises_client_error() -> None:
             with pytest.raises(EjudgeClientError):
                 await client.get_submit(request)
 
-    asyncio.run(scenario())
+    run(scenario())
+
+
+def test_mock_transport_rejects_unconfigured_action(run) -> None:
+    async def scenario() -> None:
+        transport, calls = create_mock_transport(submit_run=make_submit_run_reply())
+
+        async with EjudgeClient('https://ejudge.local/cgi-bin/master', 'token', transport=transport) as client:
+            request = GetUserRequest(contest_id=1, other_user_id=2)
+            with pytest.raises(EjudgeClientError, match='404'):
+                await client.get_user(request)
+
+        assert len(calls) == 1
+        assert calls[0].url.params['action'] == 'get-user'
+
+    run(scenario())
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from backend.ejudge import (
+    GetSubmitRequest,
+    GetUserReply,
+    GetUserRequest,
+    NotificationTarget,
+    SubmitDetails,
+    SubmitRunInputRequest,
+    SubmitRunRequest,
+    build_all_models,
+)
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'message'),
+    [
+        ({'lang_id': 'py3', 'text_form': 'pass'}, 'Exactly one of ``problem_uuid``'),
+        ({'problem': 1, 'problem_name': 'A', 'lang_id': 'py3', 'text_form': 'pass'}, 'Exactly one of ``problem_uuid``'),
+        ({'problem': 1, 'text_form': 'pass'}, 'Exactly one of ``language_name`` or ``lang_id``'),
+        ({'problem': 1, 'lang_id': 'py3'}, 'Provide either ``file`` bytes'),
+        ({'problem': 1, 'lang_id': 'py3', 'text_form': 'pass', 'notify_driver': 1}, 'Notification parameters must be provided together'),
+    ],
+)
+def test_submit_run_request_rejects_invalid_selectors(kwargs: dict, message: str) -> None:
+    with pytest.raises(ValidationError, match=message):
+        SubmitRunRequest(contest_id=1, **kwargs)
+
+
+def test_submit_run_request_accepts_full_notification_triplet() -> None:
+    request = SubmitRunRequest(
+        contest_id=1,
+        problem=1,
+        lang_id='py3',
+        text_form='pass',
+        notify_driver=1,
+        notify_kind='str',
+        notify_queue='results',
+    )
+    assert request.notify_queue == 'results'
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'message'),
+    [
+        ({'text_form_input': ''}, 'for the source code'),
+        ({'text_form': 'pass'}, 'for stdin'),
+        ({'text_form': 'pass', 'text_form_input': '', 'notify_kind': 'str'}, 'Notification parameters must be provided together'),
+    ],
+)
+def test_submit_run_input_request_rejects_invalid_payloads(kwargs: dict, message: str) -> None:
+    with pytest.raises(ValidationError, match=message):
+        SubmitRunInputRequest(contest_id=1, prob_id='A', lang_id='py3', **kwargs)
+
+
+def test_get_user_request_requires_single_selector() -> None:
+    with pytest.raises(ValidationError, match='Exactly one of ``other_user_id`` or ``other_user_login``'):
+        GetUserRequest(contest_id=1)
+
+
+def test_identifiers_are_trimmed_but_source_payload_is_kept_verbatim() -> None:
+    request = SubmitRunRequest(contest_id=1, problem=1, lang_id=' py3 ', sender_user_login=' bob ', text_form='  print(1)\n')
+    assert request.lang_id == 'py3'
+    assert request.sender_user_login == 'bob'
+    assert request.text_form == '  print(1)\n'
+
+
+def test_notification_target_queue_is_trimmed_and_non_empty() -> None:
+    assert NotificationTarget(driver=1, kind='str', queue='  q1 ').queue == 'q1'
+    with pytest.raises(ValidationError):
+        NotificationTarget(driver=1, kind='str', queue='   ')
+
+
+def test_action_is_a_class_constant_included_in_dumps() -> None:
+    request = GetSubmitRequest(contest_id=1, submit_id=2)
+    assert 'action' not in GetSubmitRequest.model_fields
+    assert request.action == 'get-submit'
+    assert request.model_dump() == {'contest_id': 1, 'submit_id': 2, 'action': 'get-submit'}
+
+
+def test_build_all_models_compiles_deferred_validators() -> None:
+    build_all_models()
+    assert SubmitDetails.__pydantic_complete__
+    assert GetUserReply.__pydantic_complete__
+
+
+def test_reply_result_is_validated_against_parametrized_payload() -> None:
+    reply = GetUserReply.model_validate({'ok': True, 'action': 'get-user', 'result': {'user_id': 7, 'user_login': 'bob'}})
+    assert reply.result is not None
+    assert reply.result.user_id == 7
+    with pytest.raises(ValidationError):
+        GetUserReply.model_validate({'ok': True, 'action': 'get-user', 'result': {'user_id': 0}})
+
+
+def test_get_user_request_accepts_global_by_alias_and_by_name() -> None:
+    assert GetUserRequest(contest_id=1, other_user_id=2, global_=True).global_ is True
+    assert GetUserRequest.model_validate({'contest_id': 1, 'other_user_id': 2, 'global': True}).global_ is True
+
+
+def test_action_is_included_in_json_dumps() -> None:
+    request = GetSubmitRequest(contest_id=1, submit_id=2)
+    assert request.model_dump_json() == '{"contest_id":1,"submit_id":2,"action":"get-submit"}'
+
+
+def test_action_respects_include_and_exclude() -> None:
+    request = GetSubmitRequest(contest_id=1, submit_id=2)
+    assert request.model_dump(include={'submit_id'}) == {'submit_id': 2}
+    assert request.model_dump(include={'submit_id', 'action'}) == {'submit_id': 2, 'action': 'get-submit'}
+    assert request.model_dump(exclude={'action'}) == {'contest_id': 1, 'submit_id': 2}
+    assert request.model_dump(exclude={'contest_id'}) == {'submit_id': 2, 'action': 'get-submit'}
+
+
+def test_identifier_descriptions_reach_json_schema() -> None:
+    assert GetSubmitRequest.model_json_schema()['properties']['contest_id']['description'] == 'Unique ejudge contest identifier.'
+    properties = SubmitDetails.model_json_schema()['properties']
+    for name in ('submit_id', 'user_id', 'prob_id', 'lang_id', 'time', 'max_rss'):
+        assert properties[name]['description'], name
+
+
+def test_dumps_round_trip_through_validation() -> None:
+    request = GetSubmitRequest(contest_id=1, submit_id=2)
+    assert GetSubmitRequest.model_validate(request.model_dump()) == request
+    assert GetSubmitRequest.model_validate_json(request.model_dump_json()) == request
+    with pytest.raises(ValidationError, match="``action`` must be 'get-submit'"):
+        GetSubmitRequest.model_validate({'contest_id': 1, 'submit_id': 2, 'action': 'get-user'})
+
+
+def test_serialization_schema_keeps_fields_and_lists_action() -> None:
+    schema = GetUserRequest.model_json_schema(mode='serialization')
+    assert {'contest_id', 'other_user_id', 'other_user_login', 'global', 'action'} <= schema['properties'].keys()
+    assert schema['properties']['action']['const'] == 'get-user'
+    assert 'action' not in GetUserRequest.model_json_schema()['properties']
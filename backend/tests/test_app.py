@@ -1,6 +1,19 @@
 # backend/tests/test_app.py
 from __future__ import annotations
 
+import time
+
+import bcrypt
+import jwt
+import pytest
+from sqlalchemy import select
+
+from backend.app import auth
+from backend.app.auth import create_access_token, decode_token
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.db import User
+
 
 def _bearer(token: str) -> dict[str, str]:
     return {'Authorization': f'Bearer {token}'}
@@ -83,3 +96,107 @@ def test_private_middleware_blocks_unauthenticated_and_allows_valid_token(client
     r2 = client.get('/private/ping', headers=_bearer(access))
     assert r2.status_code == 200
     assert r2.json() == {'status': 'private-ok'}
+
+
+def test_decode_token_rejects_cached_token_after_expiry(monkeypatch):
+    token = create_access_token('frank@example.com', 1)
+    assert decode_token(token)['sub'] == 'frank@example.com'
+
+    later = time.time() + 3 * 60 * 60
+    monkeypatch.setattr(time, 'time', lambda: later)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        decode_token(token)
+    # The expired entry is evicted rather than kept until the cache fills up.
+    assert token not in auth._verified_tokens
+
+
+def test_tokens_without_uid_claim_are_still_accepted(client):
+    _register(client, 'grace@example.com', 'pw')
+    legacy = jwt.encode({'sub': 'grace@example.com', 'exp': int(time.time()) + 60}, settings.secret_key, algorithm=settings.algorithm)
+
+    r = client.get('/items', headers=_bearer(legacy))
+    assert r.status_code == 200 and r.json() == []
+
+    r2 = client.post('/auth/refresh', headers=_bearer(legacy))
+    assert r2.status_code == 200
+    assert decode_token(r2.json()['access_token'])['uid'] == _stored_id(client, 'grace@example.com')
+
+
+def test_cors_allows_loopback_alias_of_frontend_origin(client):
+    alias = settings.frontend_origin.rstrip('/').replace('localhost', '127.0.0.1')
+    r = client.options('/items', headers={'Origin': alias, 'Access-Control-Request-Method': 'GET'})
+    assert r.status_code == 200
+    assert r.headers['access-control-allow-origin'] == alias
+
+
+def test_passwords_longer_than_bcrypt_limit_round_trip(client):
+    password = 'ж' * 50  # 100 UTF-8 bytes, past bcrypt's 72-byte input limit
+    _register(client, 'heidi@example.com', password)
+    r = client.post('/auth/login', json={'email': 'heidi@example.com', 'password': password})
+    assert r.status_code == 200
+
+
+def _stored_hash(client, email: str) -> str:
+    async def fetch() -> str:
+        async with engine.connect() as conn:
+            return await conn.scalar(select(User.hashed_password).where(User.email == email))
+
+    return client.portal.call(fetch)
+
+
+def _stored_id(client, email: str) -> int:
+    async def fetch() -> int:
+        async with engine.connect() as conn:
+            return await conn.scalar(select(User.id).where(User.email == email))
+
+    return client.portal.call(fetch)
+
+
+def test_login_upgrades_legacy_bcrypt_hash_to_argon2(client, monkeypatch):
+    monkeypatch.setattr(auth, 'get_password_hash', lambda pw: bcrypt.hashpw(pw.encode(), bcrypt.gensalt(rounds=4)).decode())
+    _register(client, 'ivan@example.com', 'pw')
+    monkeypatch.undo()
+    assert _stored_hash(client, 'ivan@example.com').startswith('$2b$')
+
+    for _ in range(2):
+        r = client.post('/auth/login', json={'email': 'ivan@example.com', 'password': 'pw'})
+        assert r.status_code == 200
+        assert _stored_hash(client, 'ivan@example.com').startswith('$argon2id$')
+
+
+def test_hs256_fast_path_matches_pyjwt_for_ascii_claims(monkeypatch):
+    monkeypatch.setattr(time, 'time', lambda: 1_700_000_000.5)
+    expected = jwt.encode({'sub': 'judy@example.com', 'uid': 3, 'exp': 1_700_000_060}, settings.secret_key, algorithm='HS256')
+    assert auth._create_token('judy@example.com', 3, 60) == expected
+
+
+def test_hs256_fast_path_non_ascii_claims_verify_with_pyjwt():
+    # orjson keeps non-ASCII as raw UTF-8 where PyJWT escapes it, so the bytes differ
+    # but the token must still decode to the same claims.
+    token = auth._create_token('jörg@example.com', 3, 60)
+    payload = jwt.decode(token, settings.secret_key, algorithms=['HS256'])
+    assert payload['sub'] == 'jörg@example.com'
+    assert payload['uid'] == 3
+
+
+def test_request_bodies_reject_unknown_fields(client):
+    r = client.post('/auth/register', json={'email': 'kate@example.com', 'password': 'pw', 'is_admin': True})
+    assert r.status_code == 422
+
+
+def test_google_users_cannot_log_in_with_a_password(client):
+    r = client.get('/auth/google/callback', params={'code': 'x'})
+    assert r.status_code == 200
+    r2 = client.post('/auth/login', json={'email': 'googleuser@example.com', 'password': '!google'})
+    assert r2.status_code == 401
+
+
+def test_token_cache_keeps_recently_used_tokens(monkeypatch):
+    monkeypatch.setattr(auth, 'TOKEN_CACHE_SIZE', 2)
+    monkeypatch.setattr(auth, '_verified_tokens', {})
+    hot, a, b = (create_access_token(f'user{i}@example.com', i + 1) for i in range(3))
+    decode_token(hot)
+    decode_token(a)
+    decode_token(hot)  # refreshes ``hot`` so ``a`` becomes the eviction candidate
+    decode_token(b)
+    assert list(auth._verified_tokens) == [hot, b]